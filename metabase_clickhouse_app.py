@@ -6,14 +6,65 @@ and returns results as pandas DataFrames with optimizations and saved question s
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
 import pandas as pd
+import numpy as np
 import json
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
 from dataclasses import dataclass
 import time
+import datetime
+import numbers
+import threading
 import concurrent.futures
 
+try:
+    import orjson  # Optional: much faster JSON decoding for large result payloads
+except ImportError:
+    orjson = None
+
+try:
+    import xlsxwriter  # Optional: streaming Excel writer used by save_to_excel
+except ImportError:
+    xlsxwriter = None
+
+try:
+    import pyarrow as pa  # Optional: Arrow-backed DataFrames for large result sets
+    import pyarrow.csv as pa_csv  # Optional: multi-threaded CSV reader for exports
+except ImportError:
+    pa = None
+    pa_csv = None
+
+
+# Metabase column base_type -> pandas dtype, decided once per column instead of per cell
+METABASE_DTYPES = {
+    'type/Integer': 'Int64',
+    'type/BigInteger': 'Int64',
+    'type/Float': 'float64',
+    'type/Decimal': 'float64',
+    'type/Boolean': 'boolean',
+    'type/DateTime': 'datetime64[ns]',
+    'type/DateTimeWithLocalTZ': 'datetime64[ns]',
+    'type/DateTimeWithTZ': 'datetime64[ns]',
+    'type/Date': 'datetime64[ns]',
+}
+
+# Results at least this large are built as Arrow-backed DataFrames when pyarrow is installed
+ARROW_MIN_ROWS = 100000
+
+# Metabase column base_type -> Arrow type (other types are inferred by pyarrow)
+ARROW_TYPES = {
+    'type/Integer': pa.int64(),
+    'type/BigInteger': pa.int64(),
+    'type/Float': pa.float64(),
+    'type/Decimal': pa.float64(),
+    'type/Boolean': pa.bool_(),
+    'type/Text': pa.string(),
+} if pa is not None else {}
+
 
 @dataclass
 class MetabaseConfig:
@@ -52,12 +103,44 @@ class MetabaseConfig:
 class MetabaseClient:
     """Client for interacting with Metabase API with saved question support"""
     
+    # Process-wide lookup caches shared by every client instance
+    QUESTION_CACHE_TTL = 3600  # seconds
+    ROW_COUNT_CACHE_TTL = 3600  # seconds
+    _database_id_cache: Dict[tuple, int] = {}
+    _question_details_cache: Dict[tuple, tuple] = {}
+    _question_sql_cache: Dict[tuple, tuple] = {}
+    _row_count_cache: Dict[tuple, tuple] = {}
+    
     def __init__(self, config: MetabaseConfig):
         self.config = config
         self.session = requests.Session()
+        
+        # Pool connections so parallel workers share keep-alive TCP/TLS connections,
+        # and retry transient gateway errors instead of failing a whole page. Read errors
+        # are not retried: a timed-out query may still be running on ClickHouse
+        retries = Retry(
+            total=3,
+            read=0,
+            backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(['GET', 'POST', 'DELETE'])
+        )
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retries)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Ask for compressed responses; includes zstd/br when their decoders are installed
+        self.session.headers.update({
+            'Accept-Encoding': make_headers(accept_encoding=True)['accept-encoding']
+        })
+        
         self.session_token = None
         self.database_id = config.database_id
         
+        # Log in again when Metabase expires the session (long-lived/pooled clients)
+        self._auth_lock = threading.Lock()
+        self.session.hooks['response'].append(self._reauthenticate_on_401)
+        
         # Setup logging
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
@@ -89,10 +172,149 @@ class MetabaseClient:
             self.logger.error(f"Authentication failed: {e}")
             return False
     
+    def _reauthenticate_on_401(self, response: requests.Response, **kwargs) -> requests.Response:
+        """Session response hook: on 401, log in again and resend the request once"""
+        request = response.request
+        sent_token = request.headers.get('X-Metabase-Session')
+        if response.status_code != 401 or not sent_token or request.path_url.endswith('/api/session'):
+            return response
+        
+        # Parallel workers may all see the 401; only the first one logs in again
+        with self._auth_lock:
+            if self.session_token == sent_token:
+                self.logger.info("Metabase session expired, re-authenticating...")
+                if not self.authenticate():
+                    self.session_token = None
+                    self.session.headers.pop('X-Metabase-Session', None)
+                    return response
+            token = self.session_token
+        if not token:
+            return response
+        
+        # Release the 401 connection, then resend without hooks so a second 401 is returned as is
+        response.content
+        response.close()
+        retry = request.copy()
+        retry.headers['X-Metabase-Session'] = token
+        retry.hooks = {'response': []}
+        return self.session.send(retry, **kwargs)
+    
+    @staticmethod
+    def _parse_json(response: requests.Response) -> Dict[str, Any]:
+        """Decode a JSON response body, using orjson when available"""
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return response.json()
+    
+    @staticmethod
+    def _parse_datetimes(values: tuple) -> pd.DatetimeIndex:
+        """Parse Metabase timestamps, keeping the wall-clock time of the report timezone"""
+        parsed = pd.to_datetime(values)
+        if not isinstance(parsed, pd.DatetimeIndex):
+            # pandas 2.x returns an object Index for mixed UTC offsets (e.g. +03:30/+04:30 across DST);
+            # callers keep the raw values on TypeError
+            raise TypeError("Timestamps have mixed UTC offsets")
+        if parsed.tz is not None:
+            # Excel/CSV consumers expect naive datetimes
+            parsed = parsed.tz_localize(None)
+        return parsed
+    
+    @staticmethod
+    def _typed_column(values: tuple, base_type: Optional[str]):
+        """Convert one column's values to the dtype implied by its Metabase base_type"""
+        dtype = METABASE_DTYPES.get(base_type)
+        if dtype is None:
+            return values
+        
+        if dtype in ('Int64', 'float64'):
+            # Fill one contiguous NumPy buffer straight from the values. Only JSON numbers and
+            # nulls qualify: fromiter would truncate floats and parse numeric strings
+            count = len(values)
+            value_types = set(map(type, values))
+            try:
+                if dtype == 'Int64' and value_types <= {int}:
+                    buffer = np.fromiter(values, dtype=np.int64, count=count)
+                    return pd.arrays.IntegerArray(buffer, np.zeros(count, dtype=bool))
+                if dtype == 'Int64' and value_types <= {int, type(None)}:
+                    # Nullable integers: zero-fill the null slots and track them in a mask
+                    mask = np.fromiter((value is None for value in values), dtype=bool, count=count)
+                    buffer = np.fromiter((0 if value is None else value for value in values),
+                                         dtype=np.int64, count=count)
+                    return pd.arrays.IntegerArray(buffer, mask)
+                if dtype == 'float64' and value_types <= {int, float}:
+                    return np.fromiter(values, dtype=np.float64, count=count)
+                if dtype == 'float64' and value_types <= {int, float, type(None)}:
+                    return np.fromiter((np.nan if value is None else value for value in values),
+                                       dtype=np.float64, count=count)
+            except OverflowError:
+                pass
+            # e.g. floats/strings in an integer column or UInt64 beyond int64 - let pandas infer
+            return values
+        
+        try:
+            if dtype == 'datetime64[ns]':
+                return MetabaseClient._parse_datetimes(values)
+            return pd.array(values, dtype=dtype)
+        except (TypeError, ValueError, OverflowError):
+            # e.g. UInt64 values beyond Int64 or mixed timezone offsets - let pandas infer
+            return values
+    
+    @staticmethod
+    def _arrow_column(values: tuple, base_type: Optional[str]):
+        """Convert one column's values to an Arrow array typed from its Metabase base_type"""
+        if METABASE_DTYPES.get(base_type) == 'datetime64[ns]':
+            try:
+                return pa.Array.from_pandas(MetabaseClient._parse_datetimes(values))
+            except (TypeError, ValueError, OverflowError):
+                return pa.array(values)
+        return pa.array(values, type=ARROW_TYPES.get(base_type))
+    
+    @staticmethod
+    def _rows_to_arrow_dataframe(rows: list, cols: list) -> Optional[pd.DataFrame]:
+        """Build an Arrow-backed DataFrame, or None if a column doesn't fit its Arrow type"""
+        try:
+            arrays = [
+                MetabaseClient._arrow_column(values, col.get('base_type'))
+                for values, col in zip(zip(*rows), cols)
+            ]
+            table = pa.Table.from_arrays(arrays, names=[col['name'] for col in cols])
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, OverflowError):
+            return None
+        
+        # Strings stay in Arrow buffers instead of one Python object per cell
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    
+    @staticmethod
+    def _rows_to_dataframe(rows: list, cols: list) -> pd.DataFrame:
+        """Build a typed DataFrame column-wise from Metabase's row-major result"""
+        columns = [col['name'] for col in cols]
+        if not rows:
+            return pd.DataFrame(columns=columns)
+        
+        if pa is not None and len(rows) >= ARROW_MIN_ROWS:
+            df = MetabaseClient._rows_to_arrow_dataframe(rows, cols)
+            if df is not None:
+                return df
+        
+        # Transpose once in C, then hand pandas one typed sequence per column;
+        # the column buffers are freshly built, so adopt them without copying
+        df = pd.DataFrame({
+            i: MetabaseClient._typed_column(values, cols[i].get('base_type'))
+            for i, values in enumerate(zip(*rows))
+        }, copy=False)
+        df.columns = columns
+        return df
+    
     def get_database_id(self) -> Optional[int]:
         """Get database ID by name"""
         if self.database_id:
             return self.database_id
+        
+        cache_key = (self.config.url, self.config.database_name)
+        cached_id = self._database_id_cache.get(cache_key)
+        if cached_id is not None:
+            self.database_id = cached_id
+            return self.database_id
             
         try:
             databases_url = f"{self.config.url}/api/database"
@@ -104,6 +326,7 @@ class MetabaseClient:
             for db in databases:
                 if db.get('name') == self.config.database_name:
                     self.database_id = db.get('id')
+                    self._database_id_cache[cache_key] = self.database_id
                     self.logger.info(f"Found database ID: {self.database_id}")
                     return self.database_id
             
@@ -114,17 +337,12 @@ class MetabaseClient:
             self.logger.error(f"Failed to get database ID: {e}")
             return None
     
-    def execute_query(self, sql_query: str, timeout: int = 300, max_results: int = None) -> Optional[pd.DataFrame]:
+    def _execute_native_query(self, sql_query: str, timeout: int = 300, max_results: int = None) -> Optional[Dict[str, Any]]:
         """
-        Execute SQL query and return results as pandas DataFrame
+        Execute SQL query and return Metabase's raw result data
         
-        Args:
-            sql_query: SQL query string
-            timeout: Query timeout in seconds (default: 300)
-            max_results: Maximum number of results to return (None for unlimited)
-            
         Returns:
-            pandas DataFrame with query results or None if failed
+            Dict with 'rows' (list of row lists) and 'cols' (column metadata) or None if failed
         """
         if not self.session_token:
             self.logger.error("Not authenticated. Call authenticate() first.")
@@ -157,7 +375,7 @@ class MetabaseClient:
             response = self.session.post(query_url, json=query_payload, timeout=timeout)
             response.raise_for_status()
             
-            result = response.json()
+            result = self._parse_json(response)
             
             # Check if query was successful
             if result.get('status') != 'completed':
@@ -166,24 +384,13 @@ class MetabaseClient:
                     self.logger.error(f"Error details: {result['error']}")
                 return None
             
-            # Extract data
             data = result.get('data', {})
-            rows = data.get('rows', [])
-            columns = [col['name'] for col in data.get('cols', [])]
             
             # Check if results were truncated
-            is_truncated = data.get('results_truncated', False)
-            if is_truncated:
-                self.logger.warning("Results may have been truncated by Metabase")
-            
-            # Create DataFrame
-            df = pd.DataFrame(rows, columns=columns)
-            
-            self.logger.info(f"Query executed successfully. Retrieved {len(df)} rows, {len(df.columns)} columns")
-            if is_truncated:
+            if data.get('results_truncated', False):
                 self.logger.warning("⚠️ Results were truncated - you may not have all data!")
             
-            return df
+            return data
             
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Query execution failed: {e}")
@@ -192,51 +399,275 @@ class MetabaseClient:
             self.logger.error(f"Unexpected error during query execution: {e}")
             return None
     
-    def execute_query_with_pagination(self, sql_query: str, page_size: int = 25000) -> Optional[pd.DataFrame]:
+    def execute_query(self, sql_query: str, timeout: int = 300, max_results: int = None) -> Optional[pd.DataFrame]:
+        """
+        Execute SQL query and return results as pandas DataFrame
+        
+        Args:
+            sql_query: SQL query string
+            timeout: Query timeout in seconds (default: 300)
+            max_results: Maximum number of results to return (None for unlimited)
+            
+        Returns:
+            pandas DataFrame with query results or None if failed
+        """
+        data = self._execute_native_query(sql_query, timeout=timeout, max_results=max_results)
+        if data is None:
+            return None
+        
+        # Create DataFrame
+        df = self._rows_to_dataframe(data.get('rows', []), data.get('cols', []))
+        
+        self.logger.info(f"Query executed successfully. Retrieved {len(df)} rows, {len(df.columns)} columns")
+        return df
+    
+    def execute_query_csv(self, sql_query: str, timeout: int = 600) -> Optional[pd.DataFrame]:
+        """
+        Execute SQL query through Metabase's CSV export endpoint
+        
+        The response is streamed straight into a CSV parser (pyarrow's multi-threaded
+        reader when installed, else pandas' C parser), which avoids decoding a large
+        JSON payload into Python lists first. Columns are typed from the metadata of a
+        zero-row run of the query, so values match what the JSON path returns.
+        
+        Args:
+            sql_query: SQL query string
+            timeout: Query timeout in seconds (default: 600)
+            
+        Returns:
+            pandas DataFrame with query results or None if failed
+        """
+        if not self.session_token:
+            self.logger.error("Not authenticated. Call authenticate() first.")
+            return None
+        
+        if not self.database_id:
+            self.database_id = self.get_database_id()
+            if not self.database_id:
+                return None
+        
+        # CSV carries no types, so fetch the column metadata first
+        cols_data = self._execute_native_query(f"SELECT * FROM ({sql_query.rstrip(';')}) AS _cols LIMIT 0", max_results=1)
+        if cols_data is None:
+            self.logger.error("Could not get column types for CSV export")
+            return None
+        cols = cols_data.get('cols', [])
+        
+        try:
+            query_payload = {
+                "type": "native",
+                "native": {
+                    "query": sql_query,
+                    "template-tags": {}
+                },
+                "database": self.database_id
+            }
+            
+            # Export endpoints take the query as a form-encoded JSON string;
+            # unformatted rows keep raw numbers and ISO timestamps
+            export_url = f"{self.config.url}/api/dataset/csv"
+            form = {"query": json.dumps(query_payload), "format_rows": "false"}
+            with self.session.post(export_url, data=form, timeout=timeout, stream=True) as response:
+                response.raise_for_status()
+                
+                # Failed exports come back as a JSON error body instead of CSV
+                content_type = response.headers.get('Content-Type', '')
+                if 'csv' not in content_type:
+                    self.logger.error(f"CSV export failed: {response.text[:500]}")
+                    return None
+                
+                df = self._read_csv_response(response, cols)
+            
+            self.logger.info(f"CSV query executed successfully. Retrieved {len(df)} rows, {len(df.columns)} columns")
+            return df
+            
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"CSV query execution failed: {e}")
+            return None
+        except Exception as e:
+            self.logger.error(f"Unexpected error during CSV query execution: {e}")
+            return None
+    
+    @staticmethod
+    def _read_csv_response(response, cols: list) -> pd.DataFrame:
+        """
+        Parse a streamed CSV export body into a DataFrame typed from Metabase's column metadata
+        
+        Columns are matched by position and named like the JSON path. Text stays text
+        (e.g. voucher code '0123'), and timestamps keep their report-timezone wall clock.
+        """
+        response.raw.decode_content = True
+        names = [col['name'] for col in cols]
+        base_types = [col.get('base_type') for col in cols]
+        datetime_positions = [i for i, base_type in enumerate(base_types)
+                              if METABASE_DTYPES.get(base_type) == 'datetime64[ns]']
+        
+        if pa_csv is None:
+            dtypes = {}
+            for name, base_type in zip(names, base_types):
+                dtype = METABASE_DTYPES.get(base_type)
+                dtypes[name] = 'str' if dtype in (None, 'datetime64[ns]') else dtype
+            df = pd.read_csv(response.raw, header=0, names=names, dtype=dtypes,
+                             keep_default_na=False, na_values=[''], low_memory=False)
+            for i in datetime_positions:
+                df.isetitem(i, MetabaseClient._typed_column(df.iloc[:, i].to_numpy(dtype=object), base_types[i]))
+            return df
+        
+        # Only an empty field is NULL; 'NA', 'null' etc. are ordinary text values
+        table = pa_csv.read_csv(
+            response.raw,
+            read_options=pa_csv.ReadOptions(use_threads=True, block_size=8 << 20,
+                                            column_names=names, skip_rows=1),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={name: ARROW_TYPES.get(base_type, pa.string())
+                              for name, base_type in zip(names, base_types)},
+                null_values=[''],
+                strings_can_be_null=True,
+            )
+        )
+        for i in datetime_positions:
+            values = table.column(i).to_numpy(zero_copy_only=False)
+            table = table.set_column(i, names[i], MetabaseClient._arrow_column(values, base_types[i]))
+        
+        # Release Arrow buffers column by column as pandas takes them over
+        return table.to_pandas(self_destruct=True, split_blocks=True, types_mapper=pd.ArrowDtype)
+    
+    @staticmethod
+    def _format_sql_value(value) -> str:
+        """Format a Python value as a ClickHouse SQL literal"""
+        if isinstance(value, numbers.Number):
+            return str(value)
+        escaped = str(value).replace("\\", "\\\\").replace("'", "\\'")
+        return f"'{escaped}'"
+    
+    def execute_query_with_pagination(self, sql_query: str, page_size: int = 25000,
+                                      order_key: Optional[str] = None) -> Optional[pd.DataFrame]:
         """
         Execute query with pagination to get all results (optimized version)
         
         Args:
             sql_query: SQL query string
             page_size: Number of rows per page (increased for efficiency)
+            order_key: Unique, sortable column for keyset pagination. Each page then
+                       seeks past the last key instead of re-scanning an OFFSET prefix;
+                       rows with a NULL key are fetched by OFFSET pages at the end.
             
         Returns:
             Complete pandas DataFrame with all results
         """
         self.logger.info("📄 Executing query with optimized pagination...")
         
-        all_dataframes = []
+        all_rows = []
+        cols = []
+        page_count = 0
         offset = 0
+        last_key = None
+        keyset = bool(order_key)
+        
+        # Build the fixed part of each page query once; only the key/offset changes per page.
+        # Keyset pages skip NULL keys (never > last key); those rows are OFFSET-paged afterwards
+        base_sql = sql_query.rstrip(';')
+        keyset_prefix = f"SELECT * FROM ({base_sql}) AS _keyset WHERE {order_key} IS NOT NULL"
+        keyset_suffix = f" ORDER BY {order_key} LIMIT {page_size}"
+        offset_prefix = f"SELECT * FROM ({base_sql}) AS _p LIMIT {page_size} OFFSET "
+        null_key_prefix = f"SELECT * FROM ({base_sql}) AS _p WHERE {order_key} IS NULL LIMIT {page_size} OFFSET "
         
         while True:
-            # Add LIMIT and OFFSET to the query
-            paginated_query = f"{sql_query.rstrip(';')} LIMIT {page_size} OFFSET {offset}"
+            if keyset:
+                # Keyset pagination: seek past the last key seen on the previous page
+                key_filter = f" AND {order_key} > {self._format_sql_value(last_key)}" if last_key is not None else ""
+                paginated_query = keyset_prefix + key_filter + keyset_suffix
+            else:
+                # Wrap as a subquery so a trailing ORDER BY/LIMIT in the user SQL stays intact
+                paginated_query = offset_prefix + str(offset)
             
-            df = self.execute_query(paginated_query, max_results=page_size)
+            data = self._execute_native_query(paginated_query, max_results=page_size)
+            rows = data.get('rows', []) if data else []
             
-            if df is None or len(df) == 0:
-                break
+            if keyset and not page_count:
+                key_names = [col['name'] for col in data.get('cols', [])] if data else []
+                if order_key not in key_names:
+                    self.logger.warning(f"Keyset pagination on '{order_key}' failed, falling back to OFFSET pages")
+                    return self.execute_query_with_pagination(sql_query, page_size=page_size)
+                key_index = key_names.index(order_key)
+            
+            if rows:
+                # Keep raw rows and build a single typed DataFrame at the end
+                cols = data.get('cols', [])
+                all_rows.extend(rows)
+                page_count += 1
+                if page_count % 10 == 0 and self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info("📄 Page %d: %d rows so far", page_count, len(all_rows))
             
-            all_dataframes.append(df)
-            self.logger.info(f"📄 Page {len(all_dataframes)}: {len(df):,} rows")
+            # A full page means there may be more
+            if len(rows) == page_size:
+                if keyset:
+                    last_key = rows[-1][key_index]
+                else:
+                    offset += page_size
+                continue
             
-            # If we got less than page_size, we're done
-            if len(df) < page_size:
+            if not keyset:
                 break
-                
-            offset += page_size
+            # Keyed rows are done; continue with the rows whose key is NULL
+            keyset = False
+            offset_prefix = null_key_prefix
         
-        if not all_dataframes:
+        if not page_count:
             self.logger.error("No data retrieved")
             return None
         
-        # Combine all DataFrames
-        final_df = pd.concat(all_dataframes, ignore_index=True)
+        final_df = self._rows_to_dataframe(all_rows, cols)
         self.logger.info(f"✅ Pagination complete: {len(final_df):,} total rows")
         
         return final_df
     
-    def execute_query_with_parallel_pagination(self, sql_query: str, page_size: int = 50000, max_workers: int = 6) -> Optional[pd.DataFrame]:
+    def _get_range_queries(self, sql_query: str, order_key: str, total_pages: int) -> Optional[list]:
+        """
+        Split a query into disjoint order_key ranges using ClickHouse quantiles
+        
+        Returns:
+            List of range queries (one per page) or None if boundaries can't be computed
+        """
+        base_sql = sql_query.rstrip(';')
+        levels = ", ".join(str(round(i / total_pages, 6)) for i in range(1, total_pages))
+        
+        boundaries = []
+        if levels:
+            boundary_query = f"""
+            SELECT quantiles({levels})({order_key}) as boundaries
+            FROM ({base_sql}) as subquery
+            """
+            
+            boundary_df = self.execute_query(boundary_query, max_results=1)
+            if boundary_df is None or len(boundary_df) == 0:
+                return None
+            
+            # Approximate quantiles may repeat on skewed keys; keep distinct, ordered bounds
+            boundaries = sorted(set(boundary_df.iloc[0]['boundaries']))
+        
+        # Half-open ranges (lo, hi] so every row lands in exactly one page
+        conditions = []
+        lower = None
+        for upper in boundaries + [None]:
+            parts = []
+            if lower is not None:
+                parts.append(f"{order_key} > {self._format_sql_value(lower)}")
+            if upper is not None:
+                parts.append(f"{order_key} <= {self._format_sql_value(upper)}")
+            condition = " AND ".join(parts) or "1 = 1"
+            if lower is None:
+                condition = f"({condition} OR {order_key} IS NULL)"
+            conditions.append(condition)
+            lower = upper
+        
+        return [
+            f"SELECT * FROM ({base_sql}) AS _range WHERE {condition} ORDER BY {order_key}"
+            for condition in conditions
+        ]
+    
+    def execute_query_with_parallel_pagination(self, sql_query: str, page_size: int = 50000, max_workers: int = 6,
+                                               order_key: Optional[str] = None) -> Optional[pd.DataFrame]:
         """
         Execute query with parallel pagination for maximum speed
         
@@ -244,16 +675,20 @@ class MetabaseClient:
             sql_query: SQL query string
             page_size: Number of rows per page (larger for efficiency)
             max_workers: Number of parallel connections
+            order_key: Sortable column used to split the result into disjoint key ranges,
+                       so each worker scans its own range instead of an OFFSET prefix
             
         Returns:
             Complete pandas DataFrame with all results
         """
         self.logger.info(f"🚀 Executing query with parallel pagination ({max_workers} workers)...")
         
+        base_sql = sql_query.rstrip(';')
+        
         # First, get total count to calculate pages
         count_query = f"""
         SELECT COUNT(*) as total_rows
-        FROM ({sql_query.rstrip(';')}) as subquery
+        FROM ({base_sql}) as subquery
         """
         
         count_df = self.execute_query(count_query, max_results=1)
@@ -261,7 +696,7 @@ class MetabaseClient:
             self.logger.error("Failed to get total row count")
             return None
         
-        total_rows = count_df.iloc[0]['total_rows']
+        total_rows = int(count_df.iloc[0]['total_rows'])
         total_pages = (total_rows + page_size - 1) // page_size
         
         self.logger.info(f"📊 Total rows: {total_rows:,}, Pages: {total_pages}, Page size: {page_size:,}")
@@ -269,94 +704,136 @@ class MetabaseClient:
         if total_rows == 0:
             return pd.DataFrame()
         
-        # Create separate clients for parallel execution
+        range_queries = None
+        if order_key:
+            range_queries = self._get_range_queries(sql_query, order_key, total_pages)
+            if range_queries is None:
+                self.logger.warning(f"Could not compute '{order_key}' ranges, falling back to OFFSET pages")
+            else:
+                total_pages = len(range_queries)
+        
+        offset_prefix = f"SELECT * FROM ({base_sql}) AS _p LIMIT {page_size} OFFSET "
+        
+        # Workers share this client's authenticated session (and its connection pool)
         def fetch_page(page_num):
-            """Fetch a single page with dedicated client"""
+            """Fetch a single page's raw result data over the shared session"""
             try:
-                # Create dedicated client for this thread
-                thread_client = MetabaseClient(self.config)
-                if not thread_client.authenticate():
-                    return None, page_num
-                
-                offset = page_num * page_size
-                paginated_query = f"{sql_query.rstrip(';')} LIMIT {page_size} OFFSET {offset}"
-                
-                df = thread_client.execute_query(paginated_query, max_results=page_size)
-                thread_client.logout()
+                if range_queries:
+                    # Range sizes follow the key distribution, so allow up to every row
+                    data = self._execute_native_query(range_queries[page_num], max_results=total_rows)
+                else:
+                    paginated_query = offset_prefix + str(page_num * page_size)
+                    
+                    data = self._execute_native_query(paginated_query, max_results=page_size)
                 
-                if df is not None and len(df) > 0:
-                    return df, page_num
-                return None, page_num
+                if data is None:
+                    self.logger.warning("❌ Page %d failed", page_num + 1)
+                    return None, page_num
+                if not data.get('rows'):
+                    return None, page_num
+                return data, page_num
                 
             except Exception as e:
-                self.logger.error(f"Error fetching page {page_num}: {e}")
+                self.logger.error("Error fetching page %d: %s", page_num, e)
                 return None, page_num
         
-        # Execute pages in parallel
-        all_dataframes = [None] * total_pages  # Preserve order
-        successful_pages = 0
-        
+        # Execute pages in parallel; map() yields results in page order
+        results = []
+        log_every = max(1, total_pages // 10)
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all page requests
-            future_to_page = {
-                executor.submit(fetch_page, page_num): page_num 
-                for page_num in range(total_pages)
-            }
-            
-            # Collect results
-            for future in concurrent.futures.as_completed(future_to_page):
-                df, page_num = future.result()
-                if df is not None:
-                    all_dataframes[page_num] = df
-                    successful_pages += 1
-                    self.logger.info(f"✅ Page {page_num + 1}/{total_pages}: {len(df):,} rows")
-                else:
-                    self.logger.warning(f"❌ Page {page_num + 1} failed")
+            for done, result in enumerate(executor.map(fetch_page, range(total_pages)), 1):
+                results.append(result)
+                if done % log_every == 0 and self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info("✅ Pages %d/%d fetched", done, total_pages)
         
-        # Filter out None results and combine
-        valid_dataframes = [df for df in all_dataframes if df is not None]
+        # Filter out failed pages and combine raw rows in page order
+        valid_pages = [data for data, _ in results if data is not None]
+        successful_pages = len(valid_pages)
         
-        if not valid_dataframes:
+        if not valid_pages:
             self.logger.error("No data retrieved from any page")
             return None
         
-        # Combine all DataFrames
-        final_df = pd.concat(valid_dataframes, ignore_index=True)
+        all_rows = []
+        for data in valid_pages:
+            all_rows.extend(data['rows'])
+        
+        # Build one DataFrame with one dtype decision per column
+        final_df = self._rows_to_dataframe(all_rows, valid_pages[0].get('cols', []))
         self.logger.info(f"🎉 Parallel fetch complete: {len(final_df):,} total rows ({successful_pages}/{total_pages} pages)")
         
         return final_df
     
-    def execute_query_optimized(self, sql_query: str, optimization_mode: str = "auto") -> Optional[pd.DataFrame]:
+    def execute_query_optimized(self, sql_query: str, optimization_mode: str = "auto",
+                                order_key: Optional[str] = None) -> Optional[pd.DataFrame]:
         """
         Execute query with automatic optimization based on estimated size
         
         Args:
             sql_query: SQL query string
-            optimization_mode: "auto", "single", "pagination", "parallel"
+            optimization_mode: "auto", "single", "csv", "pagination", "parallel"
+            order_key: Optional unique, sortable column for keyset/range pagination
             
         Returns:
             Complete pandas DataFrame optimized for query size
         """
         
         if optimization_mode == "auto":
-            # Get estimated row count first
+            single_limit = 50000
+            base_sql = sql_query.rstrip(';')
+            
             count_query = f"""
             SELECT COUNT(*) as total_rows
-            FROM ({sql_query.rstrip(';')}) as subquery
+            FROM ({base_sql}) as subquery
             """
+            first_page_query = f"SELECT * FROM ({base_sql}) as subquery LIMIT {single_limit + 1}"
+            
+            # Repeat runs of the same SQL reuse the row count from the previous run
+            count_key = (self.config.url, self.config.database_name, sql_query)
+            cached_count = self._row_count_cache.get(count_key)
+            total_rows = None
+            if cached_count is not None and time.time() - cached_count[0] < self.ROW_COUNT_CACHE_TTL:
+                total_rows = cached_count[1]
+                self.logger.info(f"📊 Cached row count: {total_rows:,}")
+            
+            if total_rows is None or total_rows <= single_limit:
+                # Run the row count (unless cached) and an optimistic first page concurrently;
+                # small results are complete after the first page and the count is dropped
+                executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+                try:
+                    count_future = None
+                    if total_rows is None:
+                        count_future = executor.submit(self.execute_query, count_query, max_results=1)
+                    first_page_future = executor.submit(self.execute_query, first_page_query, max_results=single_limit + 1)
+                    
+                    first_page_df = first_page_future.result()
+                    if first_page_df is not None and len(first_page_df) <= single_limit:
+                        self._row_count_cache[count_key] = (time.time(), len(first_page_df))
+                        self.logger.info(f"📊 Complete result in first page: {len(first_page_df):,} rows")
+                        return first_page_df
+                    
+                    # A cached small count is stale once the first page overflows
+                    if count_future is not None:
+                        count_df = count_future.result()
+                    else:
+                        count_df = self.execute_query(count_query, max_results=1)
+                finally:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                
+                total_rows = int(count_df.iloc[0]['total_rows']) if count_df is not None else None
+                if total_rows is not None:
+                    self._row_count_cache[count_key] = (time.time(), total_rows)
             
-            count_df = self.execute_query(count_query, max_results=1)
-            if count_df is None:
+            if total_rows is None:
                 self.logger.warning("Could not estimate size, using parallel mode")
                 optimization_mode = "parallel"
             else:
-                total_rows = count_df.iloc[0]['total_rows']
                 self.logger.info(f"📊 Estimated rows: {total_rows:,}")
                 
                 if total_rows <= 50000:
                     optimization_mode = "single"
                 elif total_rows <= 500000:
-                    optimization_mode = "pagination"
+                    optimization_mode = "csv"
                 else:
                     optimization_mode = "parallel"
                 
@@ -365,21 +842,33 @@ class MetabaseClient:
         # Execute based on optimization mode
         if optimization_mode == "single":
             return self.execute_query(sql_query, max_results=100000)
+        elif optimization_mode == "csv":
+            df = self.execute_query_csv(sql_query)
+            if df is not None:
+                return df
+            self.logger.warning("CSV export failed, falling back to pagination")
+            return self.execute_query_with_pagination(sql_query, page_size=25000, order_key=order_key)
         elif optimization_mode == "pagination":
-            return self.execute_query_with_pagination(sql_query, page_size=25000)
+            return self.execute_query_with_pagination(sql_query, page_size=25000, order_key=order_key)
         elif optimization_mode == "parallel":
-            return self.execute_query_with_parallel_pagination(sql_query, page_size=50000, max_workers=6)
+            return self.execute_query_with_parallel_pagination(sql_query, page_size=50000, max_workers=6, order_key=order_key)
         else:
             # Default to parallel for unknown modes
-            return self.execute_query_with_parallel_pagination(sql_query, page_size=50000, max_workers=6)
+            return self.execute_query_with_parallel_pagination(sql_query, page_size=50000, max_workers=6, order_key=order_key)
     
     def execute_saved_question(self, question_id: int, parameters: dict = None) -> Optional[pd.DataFrame]:
-        """Execute a saved Metabase question by ID"""
+        """Execute a saved Metabase question by ID (CSV export first when pyarrow is installed)"""
         
         if not self.session_token:
             self.logger.error("Not authenticated. Call authenticate() first.")
             return None
         
+        if pa_csv is not None:
+            df = self._execute_saved_question_csv(question_id, parameters)
+            if df is not None:
+                return df
+            self.logger.info("CSV export unavailable, falling back to JSON...")
+        
         try:
             question_url = f"{self.config.url}/api/card/{question_id}/query"
             payload = {}
@@ -391,17 +880,15 @@ class MetabaseClient:
             response = self.session.post(question_url, json=payload, timeout=300)
             response.raise_for_status()
             
-            result = response.json()
+            result = self._parse_json(response)
             
             if result.get('status') != 'completed':
                 self.logger.error(f"Question {question_id} execution failed with status: {result.get('status')}")
                 return None
             
             data = result.get('data', {})
-            rows = data.get('rows', [])
-            columns = [col['name'] for col in data.get('cols', [])]
             
-            df = pd.DataFrame(rows, columns=columns)
+            df = self._rows_to_dataframe(data.get('rows', []), data.get('cols', []))
             self.logger.info(f"Question {question_id} executed successfully. Retrieved {len(df)} rows, {len(df.columns)} columns")
             
             return df
@@ -409,43 +896,142 @@ class MetabaseClient:
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Failed to execute question {question_id}: {e}")
             return None
+        except ValueError as e:
+            # Malformed/HTML body; orjson's decode error is a ValueError, not a RequestException
+            self.logger.error(f"Question {question_id} returned an invalid response: {e}")
+            return None
 
+    def _execute_saved_question_csv(self, question_id: int, parameters: dict = None) -> Optional[pd.DataFrame]:
+        """Execute a saved question through its CSV export endpoint, or None if that fails"""
+        # CSV carries no types; the card's result metadata has them
+        cols = (self.get_question_details(question_id) or {}).get('result_metadata')
+        if not cols:
+            self.logger.info(f"Question {question_id} has no column metadata for CSV export")
+            return None
+        
+        try:
+            export_url = f"{self.config.url}/api/card/{question_id}/query/csv"
+            form = {"format_rows": "false"}
+            if parameters:
+                form["parameters"] = json.dumps(parameters)
+            
+            with self.session.post(export_url, data=form, timeout=600, stream=True) as response:
+                response.raise_for_status()
+                
+                if 'csv' not in response.headers.get('Content-Type', ''):
+                    self.logger.warning(f"Question {question_id} CSV export failed: {response.text[:500]}")
+                    return None
+                
+                df = self._read_csv_response(response, cols)
+            
+            self.logger.info(f"Question {question_id} exported successfully. Retrieved {len(df)} rows, {len(df.columns)} columns")
+            return df
+            
+        except Exception as e:
+            self.logger.warning(f"Question {question_id} CSV export failed: {e}")
+            return None
+    
     def get_question_details(self, question_id: int) -> Optional[dict]:
-        """Get details about a saved question"""
+        """Get details about a saved question (cached for QUESTION_CACHE_TTL seconds)"""
         
         if not self.session_token:
             return None
         
+        cache_key = (self.config.url, question_id)
+        cached = self._question_details_cache.get(cache_key)
+        if cached is not None and time.time() - cached[0] < self.QUESTION_CACHE_TTL:
+            return cached[1]
+        
         try:
             question_url = f"{self.config.url}/api/card/{question_id}"
             response = self.session.get(question_url)
             response.raise_for_status()
             
-            return response.json()
+            details = response.json()
+            self._question_details_cache[cache_key] = (time.time(), details)
+            return details
             
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Failed to get question {question_id} details: {e}")
             return None
 
+    def _get_question_sql(self, question_id: int) -> Optional[str]:
+        """Get a saved question's native SQL (cached for QUESTION_CACHE_TTL seconds)"""
+        cache_key = (self.config.url, question_id)
+        cached = self._question_sql_cache.get(cache_key)
+        if cached is not None and time.time() - cached[0] < self.QUESTION_CACHE_TTL:
+            return cached[1]
+        
+        question_details = self.get_question_details(question_id)
+        if not question_details:
+            return None
+        
+        self.logger.info(f"Question: {question_details.get('name', 'Unknown')}")
+        
+        # Non-native (GUI) questions are cached as '' so they go straight to direct execution
+        sql_query = ''
+        dataset_query = question_details.get('dataset_query', {})
+        if dataset_query.get('type') == 'native':
+            sql_query = dataset_query.get('native', {}).get('query', '')
+        
+        self._question_sql_cache[cache_key] = (time.time(), sql_query)
+        return sql_query
+    
     def execute_saved_question_optimized(self, question_id: int, optimization_mode: str = "auto") -> Optional[pd.DataFrame]:
         """Execute saved question with optimization"""
         
-        question_details = self.get_question_details(question_id)
+        sql_query = self._get_question_sql(question_id)
         
-        if question_details:
-            self.logger.info(f"Question: {question_details.get('name', 'Unknown')}")
-            
-            dataset_query = question_details.get('dataset_query', {})
-            if dataset_query.get('type') == 'native':
-                sql_query = dataset_query.get('native', {}).get('query', '')
-                
-                if sql_query:
-                    self.logger.info("Found native SQL query, using optimization...")
-                    return self.execute_query_optimized(sql_query, optimization_mode)
+        if sql_query:
+            self.logger.info("Found native SQL query, using optimization...")
+            return self.execute_query_optimized(sql_query, optimization_mode)
         
         self.logger.info("Using direct question execution...")
         return self.execute_saved_question(question_id)
     
+    def stream_saved_question(self, question_id: int, chunk_rows: int = 50000) -> Iterator[pd.DataFrame]:
+        """
+        Yield a saved question's results as DataFrame chunks of up to chunk_rows rows
+        
+        Native SQL questions are paged serially (LIMIT/OFFSET) so only one page of raw
+        JSON rows is held at a time - lower peak memory than execute_saved_question_optimized,
+        but slower for large results. An empty result is yielded as one empty chunk; other
+        questions are executed directly and yielded as a single chunk.
+        Raises RuntimeError if a page fails after earlier chunks were yielded.
+        """
+        sql_query = self._get_question_sql(question_id)
+        
+        if not sql_query:
+            df = self.execute_saved_question(question_id)
+            if df is not None:
+                yield df
+            return
+        
+        offset_prefix = f"SELECT * FROM ({sql_query.strip().rstrip(';')}) AS _p LIMIT {chunk_rows} OFFSET "
+        offset = 0
+        chunk_count = 0
+        
+        while True:
+            data = self._execute_native_query(offset_prefix + str(offset), max_results=chunk_rows)
+            if data is None:
+                if chunk_count:
+                    raise RuntimeError(f"Question {question_id} failed at row offset {offset}")
+                return
+            
+            rows = data.get('rows', [])
+            if not rows:
+                if not chunk_count:
+                    yield self._rows_to_dataframe([], data.get('cols', []))
+                return
+            
+            chunk_count += 1
+            self.logger.info("📄 Question %d chunk %d: %d rows", question_id, chunk_count, len(rows))
+            yield self._rows_to_dataframe(rows, data.get('cols', []))
+            
+            if len(rows) < chunk_rows:
+                return
+            offset += chunk_rows
+    
     def logout(self):
         """Logout from Metabase"""
         if self.session_token:
@@ -466,41 +1052,104 @@ class VendorDataExtractor:
     def __init__(self, metabase_client: MetabaseClient):
         self.client = metabase_client
     
-    def execute_query_from_warehouse(self, query_func, use_pagination: bool = True, optimization_mode: str = "auto", **kwargs):
+    def execute_query_from_warehouse(self, query_func, use_pagination: bool = True, optimization_mode: str = "auto",
+                                     order_key: Optional[str] = None, **kwargs):
         """
         Execute a query from the query warehouse with optimizations
         
+        Order flags the warehouse leaves to pandas (organic, non_organic, ...) are added
+        to the result, keyed on query_func's __name__.
+        
         Args:
             query_func: Function that returns SQL query string
             use_pagination: Whether to use pagination
             optimization_mode: "auto", "single", "pagination", "parallel", "fast"
+            order_key: Optional unique, sortable column for keyset/range pagination
             **kwargs: Arguments to pass to query function
         """
         query = query_func(**kwargs)
         
         if optimization_mode == "fast" or optimization_mode == "parallel":
             # Use parallel pagination for maximum speed
-            return self.client.execute_query_with_parallel_pagination(query, page_size=50000, max_workers=6)
+            df = self.client.execute_query_with_parallel_pagination(query, page_size=50000, max_workers=6, order_key=order_key)
         elif optimization_mode == "auto":
             # Let the system decide the best method
-            return self.client.execute_query_optimized(query, optimization_mode="auto")
+            df = self.client.execute_query_optimized(query, optimization_mode="auto", order_key=order_key)
         elif use_pagination:
-            return self.client.execute_query_with_pagination(query, page_size=25000)
+            df = self.client.execute_query_with_pagination(query, page_size=25000, order_key=order_key)
         else:
-            return self.client.execute_query(query, max_results=100000)
+            df = self.client.execute_query(query, max_results=100000)
+        
+        try:
+            from query_warehouse import add_order_flags
+        except ImportError:
+            return df
+        return add_order_flags(df, getattr(query_func, '__name__', ''), kwargs.get('columns'))
     
     def save_to_csv(self, df: pd.DataFrame, filename: str = "data_export.csv"):
         """Save DataFrame to CSV file"""
         try:
+            # pandas' writer keeps the established file format (pyarrow's differs in quoting, booleans and timestamps)
             df.to_csv(filename, index=False)
             print(f"💾 Data saved to {filename}")
         except Exception as e:
             print(f"❌ Failed to save CSV: {e}")
     
+    @staticmethod
+    def _write_excel_streaming(df: pd.DataFrame, filename: str):
+        """
+        Write DataFrame with xlsxwriter in constant_memory mode
+        
+        Each row is flushed to disk as soon as it is written instead of building the
+        whole workbook in memory. constant_memory requires strictly row-by-row writes,
+        which pandas' column-wise to_excel doesn't do, so rows are written here directly.
+        """
+        # xlsxwriter silently drops cells past the sheet limits, so refuse like to_excel does
+        max_rows, max_cols = 1048576, 16384
+        if len(df) + 1 > max_rows or len(df.columns) > max_cols:
+            raise ValueError(
+                f"This sheet is too large! Your sheet size is: {len(df)}, {len(df.columns)} "
+                f"Max sheet size is: {max_rows}, {max_cols}"
+            )
+        
+        # Excel has no timezones; write tz-aware timestamps as their wall-clock time
+        workbook = xlsxwriter.Workbook(filename, {'constant_memory': True, 'remove_timezone': True})
+        try:
+            worksheet = workbook.add_worksheet()
+            # Date/time values are written as Excel serial numbers, so each kind needs a format;
+            # datetime before date, since datetime is a date subclass
+            temporal_formats = (
+                (datetime.datetime, workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm:ss'})),
+                (datetime.date, workbook.add_format({'num_format': 'yyyy-mm-dd'})),
+                (datetime.time, workbook.add_format({'num_format': 'hh:mm:ss'})),
+                (datetime.timedelta, workbook.add_format({'num_format': '[h]:mm:ss'})),
+            )
+            header_format = workbook.add_format({'bold': True})
+            
+            worksheet.write_row(0, 0, [str(col) for col in df.columns], header_format)
+            
+            for row_num, row in enumerate(df.itertuples(index=False, name=None), start=1):
+                for col_num, value in enumerate(row):
+                    # Leave missing values as blank cells
+                    if value is None or value is pd.NA or value is pd.NaT or (isinstance(value, float) and value != value):
+                        continue
+                    if isinstance(value, (datetime.date, datetime.time, datetime.timedelta)):
+                        cell_format = next(fmt for kind, fmt in temporal_formats if isinstance(value, kind))
+                        worksheet.write_datetime(row_num, col_num, value, cell_format)
+                    elif isinstance(value, (list, tuple, dict)):
+                        worksheet.write_string(row_num, col_num, str(value))
+                    else:
+                        worksheet.write(row_num, col_num, value)
+        finally:
+            workbook.close()
+    
     def save_to_excel(self, df: pd.DataFrame, filename: str = "data_export.xlsx"):
         """Save DataFrame to Excel file"""
         try:
-            df.to_excel(filename, index=False)
+            if xlsxwriter is not None:
+                self._write_excel_streaming(df, filename)
+            else:
+                df.to_excel(filename, index=False)
             print(f"💾 Data saved to {filename}")
         except Exception as e:
             print(f"❌ Failed to save Excel: {e}")
@@ -513,8 +1162,12 @@ class VendorDataExtractor:
         csv_filename = f"{base_name}_{timestamp}.csv"
         excel_filename = f"{base_name}_{timestamp}.xlsx"
         
-        self.save_to_csv(df, csv_filename)
-        self.save_to_excel(df, excel_filename)
+        # Write both files concurrently; the CSV and Excel writers spend most of their time in C/IO
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            csv_future = executor.submit(self.save_to_csv, df, csv_filename)
+            excel_future = executor.submit(self.save_to_excel, df, excel_filename)
+            csv_future.result()
+            excel_future.result()
         
         return csv_filename, excel_filename
 
@@ -4,11 +4,26 @@ OFOOD Data Access - Complete Fixed Version with Saved Question Support
 Single-line data access interface for live Metabase data with full question support
 """
 
-import pandas as pd
-from typing import Optional
+from __future__ import annotations
+
+from typing import Optional, TYPE_CHECKING
 import os
-from metabase_clickhouse_app import MetabaseClient, MetabaseConfig, VendorDataExtractor
-from query_warehouse import QueryRegistry, CoreQueries
+import time
+import atexit
+import hashlib
+import threading
+import functools
+import inspect
+import importlib.util
+import concurrent.futures
+from pathlib import Path
+from query_warehouse import QueryRegistry, CoreQueries, render_query
+
+# pandas and the Metabase client (numpy, requests, pyarrow) are imported on first use,
+# so `python ofood_data.py` can print its help text without loading them
+if TYPE_CHECKING:
+    import pandas as pd
+    from metabase_clickhouse_app import MetabaseClient, MetabaseConfig
 
 
 class OFoodConfig:
@@ -30,6 +45,7 @@ class OFoodConfig:
                 "3. Update DEFAULT_PASSWORD in ofood_data.py"
             )
         
+        from metabase_clickhouse_app import MetabaseConfig
         return MetabaseConfig.create_with_team_db(
             url=cls.DEFAULT_URL,
             username=cls.DEFAULT_USERNAME,
@@ -38,29 +54,196 @@ class OFoodConfig:
         )
 
 
-def _execute_query(query_func, team: str = None, password: str = None, use_pagination: bool = True, 
-                  optimization_mode: str = "auto", **query_params) -> Optional[pd.DataFrame]:
+# Authenticated clients reused across calls: (url, database, username, password digest) -> client
+_client_pool = {}
+_client_pool_lock = threading.Lock()
+
+
+def _get_client(team: str = None, password: str = None) -> Optional[MetabaseClient]:
+    """
+    Return a pooled, authenticated client for team/password (logging in on first use)
+    
+    Pooled clients log in again by themselves when Metabase expires their session; a
+    client whose re-login failed has no session token and is replaced here.
+    """
+    from metabase_clickhouse_app import MetabaseClient
+    
     config = OFoodConfig.get_config(team=team, password=password)
+    key = (config.url, config.database_name, config.username,
+           hashlib.sha256(config.password.encode()).hexdigest())
+    
+    with _client_pool_lock:
+        client = _client_pool.get(key)
+    if client is not None and client.session_token:
+        return client
+    
+    # Log in outside the lock so other teams' lookups aren't held up by the round trip
     client = MetabaseClient(config)
+    if not client.authenticate():
+        return None
+    
+    with _client_pool_lock:
+        pooled = _client_pool.get(key)
+        if pooled is not None and pooled.session_token:
+            client, surplus = pooled, client  # another thread logged in first
+        else:
+            _client_pool[key], surplus = client, None
+    if surplus is not None:
+        surplus.logout()
+    return client
+
+
+def _logout_all():
+    """Log out every pooled client"""
+    with _client_pool_lock:
+        clients = list(_client_pool.values())
+        _client_pool.clear()
+    for client in clients:
+        client.logout()
+
+
+atexit.register(_logout_all)
+
+
+# Low-cardinality text stored as category. Integer columns keep their width: narrow ints
+# would silently wrap in ordinary arithmetic (e.g. year * 100 + month)
+_CATEGORICAL_COLS = {'business_line', 'marketing_area', 'type', 'code', 'discount_strategy'}
+
+
+def _compact_dtypes(df: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """Store known low-cardinality text columns as category"""
+    if df is None or not df.columns.is_unique:
+        return df
+    
+    from pandas.api.types import is_string_dtype
+    
+    for column in _CATEGORICAL_COLS.intersection(df.columns):
+        values = df[column]
+        # Only worth it when values repeat (e.g. not for mostly-unique voucher codes)
+        if is_string_dtype(values) and values.nunique() <= len(values) // 2:
+            df[column] = values.astype('category')
+    
+    return df
+
+
+# On-disk parquet cache of warehouse results, shared across processes (OFOOD_CACHE=off disables it)
+_DISK_CACHE_SETTING = os.getenv('OFOOD_CACHE', '~/.ofood_cache')
+_DISK_CACHE = (None if _DISK_CACHE_SETTING.lower() in ('', '0', 'off', 'false')
+               else Path(_DISK_CACHE_SETTING).expanduser())
+_DISK_CACHE_TTL = 3600
+# Names of the files this module writes (sha256 hex digest), so other files there are never touched
+_DISK_CACHE_GLOB = "[0-9a-f]" * 64 + ".parquet"
+
+# Getter -> warehouse queries it runs. Getters rendering the same SQL share disk entries,
+# so invalidate_cache(name) busts the getter's queries for every getter and parameter set
+_GETTER_QUERIES = {
+    'get_vendors': ('x_map_vendor',),
+    'get_active_vendors': ('x_map_vendor',),
+    'get_vendors_by_city': ('x_map_vendor',),
+    'get_orders': ('x_map_order',),
+    'get_orders_fast': ('x_map_order',),
+    'get_vdom': ('x_vdom',),
+    'get_geo': ('x_geo',),
+    'get_vouchers': ('x_net_live_vouchers',),
+    'get_vouchers_fast': ('x_net_live_vouchers',),
+    'get_tf_vendors': ('tf_vendors',),
+    'get_tf_menu': ('tf_menu',),
+    'get_large_dataset': ('x_map_order', 'x_net_live_vouchers', 'x_vdom', 'x_geo'),
+}
+
+# Query name -> time of its last named invalidation; older disk entries of that query are ignored
+_disk_cache_invalidated = {}
+
+
+def _disk_cache_path(query_func, team: str, password: str, query_params: dict) -> Optional[Path]:
+    """
+    Cache file for the rendered SQL on this team's database, or None if caching is off
+    
+    The key also covers what shapes the frame after the fetch (the query name picks the
+    derived order flags, columns which of them are kept), since different requests can
+    render the same SQL, e.g. columns=['organic'] and ['voucher_value'].
+    """
+    if _DISK_CACHE is None or importlib.util.find_spec('pyarrow') is None:
+        return None
     
+    config = OFoodConfig.get_config(team=team, password=password)
+    try:
+        sql = render_query(query_func, **query_params)
+    except Exception:
+        return None  # let the normal path report bad parameters
+    
+    key_source = "\0".join((config.url, config.database_name, config.username, sql,
+                             getattr(query_func, '__name__', ''), repr(query_params.get('columns'))))
+    return _DISK_CACHE / f"{hashlib.sha256(key_source.encode()).hexdigest()}.parquet"
+
+
+def _read_disk_cache(path: Path, invalidated_at: float = 0.0) -> Optional[pd.DataFrame]:
+    """Load a cached result if it is younger than _DISK_CACHE_TTL and written after invalidated_at"""
     try:
-        if client.authenticate():
+        mtime = path.stat().st_mtime
+        if time.time() - mtime >= _DISK_CACHE_TTL or mtime <= invalidated_at:
+            return None
+        import pandas as pd
+        return pd.read_parquet(path, engine='pyarrow')
+    except (OSError, ValueError):
+        return None
+
+
+def _write_disk_cache(path: Path, df: pd.DataFrame):
+    """Best-effort write via a temp file, so readers never see a partial parquet file"""
+    tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        # Cached results are business data: keep the directory and files owner-only
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as tmp_file:
+            df.to_parquet(tmp_file, engine='pyarrow', compression='zstd', index=False)
+        os.replace(tmp_path, path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _execute_query(query_func, team: str = None, password: str = None, use_pagination: bool = True, 
+                  optimization_mode: str = "auto", order_key: Optional[str] = None, **query_params) -> Optional[pd.DataFrame]:
+    from metabase_clickhouse_app import VendorDataExtractor
+    
+    cache_path = _disk_cache_path(query_func, team, password, query_params)
+    
+    # The extractor renders through the same cache, so the SQL is built once per parameter set;
+    # it is named like the query so the extractor adds that query's derived order flags
+    query_renderer = functools.partial(render_query, query_func)
+    query_renderer.__name__ = getattr(query_func, '__name__', '')
+    if cache_path is not None:
+        df = _read_disk_cache(cache_path, _disk_cache_invalidated.get(query_renderer.__name__, 0.0))
+        if df is not None:
+            print(f"💾 Loaded cached result: {len(df):,} rows")
+            return df
+    
+    client = _get_client(team=team, password=password)
+    
+    try:
+        if client is not None:
             extractor = VendorDataExtractor(client)
             
             if query_params:
                 df = extractor.execute_query_from_warehouse(
-                    query_func, 
+                    query_renderer, 
                     use_pagination=use_pagination,
                     optimization_mode=optimization_mode,
+                    order_key=order_key,
                     **query_params
                 )
             else:
                 df = extractor.execute_query_from_warehouse(
-                    query_func, 
+                    query_renderer, 
                     use_pagination=use_pagination,
-                    optimization_mode=optimization_mode
+                    optimization_mode=optimization_mode,
+                    order_key=order_key
                 )
             
+            df = _compact_dtypes(df)
+            if df is not None and cache_path is not None:
+                _write_disk_cache(cache_path, df)
             return df
         else:
             print("❌ Authentication failed")
@@ -69,24 +252,79 @@ def _execute_query(query_func, team: str = None, password: str = None, use_pagin
     except Exception as e:
         print(f"❌ Error executing query: {e}")
         return None
+
+
+# Process-level result cache: (function name, bound arguments) -> (fetched_at, DataFrame)
+_query_cache = {}
+
+
+def memoize_df(ttl: int = 300):
+    """
+    Cache a getter's DataFrame per team/arguments for ttl seconds
+    
+    Failed (None) results are not cached. Hits return a shallow copy so callers
+    adding or dropping columns don't alter the cached frame.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
         
-    finally:
-        client.logout()
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            # Lists (e.g. columns) become tuples so the key is hashable
+            arguments = {name: tuple(value) if isinstance(value, list) else value
+                         for name, value in bound.arguments.items()}
+            arguments['team'] = arguments.get('team') or OFoodConfig.DEFAULT_TEAM
+            key = (fn.__name__, tuple(sorted(arguments.items())))
+            
+            cached = _query_cache.get(key)
+            if cached is not None and time.time() - cached[0] < ttl:
+                return cached[1].copy(deep=False)
+            
+            df = fn(*args, **kwargs)
+            if df is not None:
+                _query_cache[key] = (time.time(), df)
+                return df.copy(deep=False)
+            return df
+        
+        return wrapper
+    return decorator
+
+
+def invalidate_cache(name: str = None):
+    """Drop cached results for one getter (e.g. 'get_vendors'), or everything, from memory and disk"""
+    if name is None:
+        _query_cache.clear()
+        _disk_cache_invalidated.clear()
+        if _DISK_CACHE is not None:
+            for path in _DISK_CACHE.glob(_DISK_CACHE_GLOB):
+                path.unlink(missing_ok=True)
+        return
+    for key in [key for key in _query_cache if key[0] == name]:
+        _query_cache.pop(key, None)
+    # Disk entries are keyed by SQL, not getter: skip (and then rewrite) older entries of its queries
+    invalidated_at = time.time()
+    for query_name in _GETTER_QUERIES.get(name, ()):
+        _disk_cache_invalidated[query_name] = invalidated_at
 
 
 # ============================================================================
 # WAREHOUSE QUERIES
 # ============================================================================
 
+@memoize_df()
 def get_vendors(team: str = None, password: str = None) -> Optional[pd.DataFrame]:
     """Get latest vendor data with location information"""
     return _execute_query(QueryRegistry.X_MAP_VENDOR, team=team, password=password)
 
 
+@memoize_df()
 def get_orders(team: str = None, password: str = None, fast: bool = True) -> Optional[pd.DataFrame]:
     """Get comprehensive order mapping with customer analysis"""
     optimization_mode = "fast" if fast else "auto"
-    return _execute_query(QueryRegistry.X_MAP_ORDER, team=team, password=password, optimization_mode=optimization_mode)
+    return _execute_query(QueryRegistry.X_MAP_ORDER, team=team, password=password, optimization_mode=optimization_mode,
+                          order_key='order_id')
 
 
 def get_vdom(city_id: Optional[int] = None, jalali_year: int = 1403, jalali_month: int = 7, 
@@ -116,17 +354,27 @@ def get_geo(city_id: Optional[int] = None, team: str = None, password: str = Non
     )
 
 
-def get_vouchers(team: str = None, password: str = None, fast: bool = True) -> Optional[pd.DataFrame]:
-    """Get comprehensive voucher analysis with order data"""
+def _voucher_order_key(columns: Optional[list]) -> Optional[str]:
+    """order_id ranges need order_id in the projection; otherwise page by OFFSET"""
+    return 'order_id' if not columns or 'order_id' in columns else None
+
+
+@memoize_df()
+def get_vouchers(team: str = None, password: str = None, fast: bool = True,
+                 columns: Optional[list] = None) -> Optional[pd.DataFrame]:
+    """Get comprehensive voucher analysis with order data (optionally only the given columns)"""
     optimization_mode = "fast" if fast else "auto"
-    return _execute_query(QueryRegistry.X_NET_LIVE_VOUCHERS, team=team, password=password, optimization_mode=optimization_mode)
+    return _execute_query(QueryRegistry.X_NET_LIVE_VOUCHERS, team=team, password=password, optimization_mode=optimization_mode,
+                          order_key=_voucher_order_key(columns), columns=columns)
 
 
+@memoize_df()
 def get_tf_vendors(team: str = None, password: str = None) -> Optional[pd.DataFrame]:
     """Get TapsiFood vendor mapping with SnappFood cross-reference"""
     return _execute_query(QueryRegistry.TF_VENDORS, team=team, password=password)
 
 
+@memoize_df()
 def get_tf_menu(team: str = None, password: str = None) -> Optional[pd.DataFrame]:
     """Get TapsiFood menu items with pricing and discounts"""
     return _execute_query(QueryRegistry.TF_MENU, team=team, password=password)
@@ -139,13 +387,16 @@ def get_tf_menu(team: str = None, password: str = None) -> Optional[pd.DataFrame
 def get_orders_fast(team: str = None, password: str = None) -> Optional[pd.DataFrame]:
     """Ultra-fast order retrieval using parallel processing (3M+ rows in 3-4 minutes)"""
     print("🚀 Using ultra-fast parallel processing for orders...")
-    return _execute_query(QueryRegistry.X_MAP_ORDER, team=team, password=password, optimization_mode="parallel")
+    # Workers fetch order_id ranges split at quantiles instead of re-scanning OFFSET pages
+    return _execute_query(QueryRegistry.X_MAP_ORDER, team=team, password=password, optimization_mode="parallel",
+                          order_key='order_id')
 
 
-def get_vouchers_fast(team: str = None, password: str = None) -> Optional[pd.DataFrame]:
+def get_vouchers_fast(team: str = None, password: str = None, columns: Optional[list] = None) -> Optional[pd.DataFrame]:
     """Ultra-fast voucher retrieval using parallel processing"""
     print("🚀 Using ultra-fast parallel processing for vouchers...")
-    return _execute_query(QueryRegistry.X_NET_LIVE_VOUCHERS, team=team, password=password, optimization_mode="parallel")
+    return _execute_query(QueryRegistry.X_NET_LIVE_VOUCHERS, team=team, password=password, optimization_mode="parallel",
+                          order_key=_voucher_order_key(columns), columns=columns)
 
 
 def get_large_dataset(query_name: str, team: str = None, password: str = None, **params) -> Optional[pd.DataFrame]:
@@ -164,13 +415,28 @@ def get_large_dataset(query_name: str, team: str = None, password: str = None, *
     query_params = {**default_params, **params}
     
     print(f"🚀 Ultra-fast retrieval for {query_name} with parallel processing...")
-    return _execute_query(query_func, team=team, password=password, optimization_mode="parallel", **query_params)
+    return _execute_query(query_func, team=team, password=password, optimization_mode="parallel",
+                          order_key='order_id', **query_params)
 
 
 # ============================================================================
 # SAVED METABASE QUESTIONS (NEW!)
 # ============================================================================
 
+_STREAMING_DF = False
+
+
+def set_streaming_df(enabled: bool):
+    """
+    Enable/disable chunked streaming of saved question results (off by default)
+    
+    Streaming fetches native questions in serial pages to cap peak memory, instead of
+    the size-based single/CSV/parallel strategies; use it only when memory is the limit.
+    """
+    global _STREAMING_DF
+    _STREAMING_DF = enabled
+
+
 def get_question_data(question_id: int, team: str = None, password: str = None, fast: bool = True) -> Optional[pd.DataFrame]:
     """
     Get data from existing Metabase question
@@ -191,16 +457,14 @@ def get_question_data(question_id: int, team: str = None, password: str = None,
         # With specific team and fast processing
         df = get_question_data(3132, team="growth", fast=True)
     """
+    if fast:
+        return get_question_data_fast(question_id, team=team, password=password)
     
-    config = OFoodConfig.get_config(team=team, password=password)
-    client = MetabaseClient(config)
+    client = _get_client(team=team, password=password)
     
     try:
-        if client.authenticate():
-            if fast:
-                return client.execute_saved_question_optimized(question_id, optimization_mode="auto")
-            else:
-                return client.execute_saved_question(question_id)
+        if client is not None:
+            return client.execute_saved_question(question_id)
         else:
             print("❌ Authentication failed")
             return None
@@ -208,20 +472,21 @@ def get_question_data(question_id: int, team: str = None, password: str = None,
     except Exception as e:
         print(f"❌ Error executing question: {e}")
         return None
-        
-    finally:
-        client.logout()
 
 
-def get_question_data_fast(question_id: int, team: str = None, password: str = None) -> Optional[pd.DataFrame]:
+@memoize_df()
+def get_question_data_fast(question_id: int, team: str = None, password: str = None,
+                           client: Optional[MetabaseClient] = None) -> Optional[pd.DataFrame]:
     """
     Ultra-fast execution of existing Metabase question
-    Gets ALL rows with parallel processing optimization!
+    Gets ALL rows: native questions are auto-optimized by size (single query, CSV export
+    or parallel pages), or streamed in serial chunks when set_streaming_df(True)
     
     Args:
         question_id: Metabase question ID
         team: Database team - optional
         password: Metabase password - optional
+        client: Already authenticated client to use instead of the pooled one - optional
     
     Examples:
         # Your question: https://metabase.ofood.cloud/question/3132-x-net
@@ -230,11 +495,32 @@ def get_question_data_fast(question_id: int, team: str = None, password: str = N
         # With team specification
         df = get_question_data_fast(3132, team="growth")
     """
+    import pandas as pd
+    
     print(f"🚀 Executing question {question_id} with optimization...")
-    return get_question_data(question_id, team=team, password=password, fast=True)
+    client = client or _get_client(team=team, password=password)
+    
+    try:
+        if client is not None:
+            if _STREAMING_DF:
+                # Build per-page chunks so raw JSON rows are never held for the whole result;
+                # no chunk at all means the first page failed, so try the optimized path
+                chunks = list(client.stream_saved_question(question_id))
+                if len(chunks) == 1:
+                    return chunks[0]
+                if chunks:
+                    return pd.concat(chunks, ignore_index=True)
+            return client.execute_saved_question_optimized(question_id, optimization_mode="auto")
+        else:
+            print("❌ Authentication failed")
+            return None
+            
+    except Exception as e:
+        print(f"❌ Error executing question: {e}")
+        return None
 
 
-def get_multiple_questions(question_ids: list, team: str = None, password: str = None) -> dict:
+def get_multiple_questions(question_ids: list, team: str = None, password: str = None, max_workers: int = 4) -> dict:
     """
     Get data from multiple Metabase questions at once
     
@@ -242,6 +528,7 @@ def get_multiple_questions(question_ids: list, team: str = None, password: str =
         question_ids: List of question IDs
         team: Database team - optional
         password: Metabase password - optional
+        max_workers: Questions fetched concurrently over one shared session
     
     Returns:
         Dictionary with question_id as key and DataFrame as value
@@ -252,17 +539,29 @@ def get_multiple_questions(question_ids: list, team: str = None, password: str =
         df_1234 = results[1234]
     """
     
-    results = {}
+    # Keep the caller's question order regardless of completion order
+    results = {question_id: None for question_id in question_ids}
+    if not results:
+        return results
+    
+    client = _get_client(team=team, password=password)
     
-    for question_id in question_ids:
+    def fetch_question(question_id):
         print(f"📊 Processing question {question_id}...")
-        df = get_question_data_fast(question_id, team=team, password=password)
-        results[question_id] = df
+        df = get_question_data_fast(question_id, team=team, password=password, client=client)
         
         if df is not None:
             print(f"   ✅ Question {question_id}: {len(df):,} rows")
         else:
             print(f"   ❌ Question {question_id}: Failed")
+        return df
+    
+    # Questions are I/O-bound; a small pool avoids saturating Metabase
+    workers = max(1, min(len(results), max_workers))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(fetch_question, question_id): question_id for question_id in results}
+        for future in concurrent.futures.as_completed(futures):
+            results[futures[future]] = future.result()
     
     return results
 
@@ -271,20 +570,16 @@ def get_multiple_questions(question_ids: list, team: str = None, password: str =
 # CONVENIENCE FUNCTIONS
 # ============================================================================
 
+@memoize_df()
 def get_active_vendors(team: str = None, password: str = None) -> Optional[pd.DataFrame]:
-    """Get only active vendors (open=1 and visible=1)"""
-    vendors_df = get_vendors(team=team, password=password)
-    if vendors_df is not None:
-        return vendors_df[(vendors_df['open'] == 1) & (vendors_df['visible'] == 1)]
-    return None
+    """Get only active vendors (open=1 and visible=1), filtered in ClickHouse"""
+    return _execute_query(CoreQueries.x_map_vendor, team=team, password=password, open_only=True, visible_only=True)
 
 
+@memoize_df()
 def get_vendors_by_city(city_id: int, team: str = None, password: str = None) -> Optional[pd.DataFrame]:
-    """Get vendors for a specific city"""
-    vendors_df = get_vendors(team=team, password=password)
-    if vendors_df is not None:
-        return vendors_df[vendors_df['city_id'] == city_id]
-    return None
+    """Get vendors for a specific city, filtered in ClickHouse"""
+    return _execute_query(CoreQueries.x_map_vendor, team=team, password=password, city_id=city_id)
 
 
 def get_all_data(team: str = None, password: str = None) -> dict:
@@ -301,15 +596,26 @@ def get_all_data(team: str = None, password: str = None) -> dict:
         ('vouchers', get_vouchers)
     ]
     
-    for name, func in datasets:
-        print(f"   Fetching {name}...")
-        df = func(team=team, password=password)
-        results[name] = df
+    # Getters share the pooled session and its connection pool, so the datasets are fetched concurrently
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(datasets)) as executor:
+        futures = {}
+        for name, func in datasets:
+            print(f"   Fetching {name}...")
+            futures[name] = executor.submit(func, team=team, password=password)
         
-        if df is not None:
-            print(f"   ✅ {name}: {len(df):,} records")
-        else:
-            print(f"   ❌ {name}: Failed")
+        for name, future in futures.items():
+            try:
+                df = future.result()
+            except Exception as e:
+                results[name] = None
+                print(f"   ❌ {name}: {e}")
+                continue
+            results[name] = df
+            
+            if df is not None:
+                print(f"   ✅ {name}: {len(df):,} records")
+            else:
+                print(f"   ❌ {name}: Failed")
     
     return results
 
@@ -329,11 +635,8 @@ def setup_credentials(password: str, team: str = "growth"):
 def test_connection(team: str = None, password: str = None) -> bool:
     """Test connection to Metabase"""
     try:
-        config = OFoodConfig.get_config(team=team, password=password)
-        client = MetabaseClient(config)
-        
-        if client.authenticate():
-            client.logout()
+        # A successful login stays pooled for the calls that usually follow
+        if _get_client(team=team, password=password) is not None:
             print("✅ Connection test successful!")
             return True
         else:
@@ -455,30 +758,46 @@ PERFORMANCE FEATURES:
 
 def quick_test():
     """Quick test of all major functions"""
+    import pandas as pd
+    
     print("🧪 QUICK TEST OF OFOOD DATA SYSTEM")
     print("=" * 50)
     
-    # Test basic functions
+    # One pooled login serves the connection check and every data test
+    print("\n🔬 Testing: Connection Test")
+    try:
+        client = _get_client()
+        connection_result = "✅ Success" if client is not None else "❌ Failed"
+    except Exception as e:
+        client = None
+        connection_result = f"❌ Error: {e}"
+    
+    # Data tests are independent, so run them concurrently over the shared session
     test_functions = [
-        ("Connection Test", lambda: test_connection()),
         ("Vendors", lambda: get_vendors()),
-        ("Question 3132", lambda: get_question_data_fast(3132)),
+        ("Question 3132", lambda: get_question_data_fast(3132, client=client)),
     ]
     
-    results = {}
+    results = {"Connection Test": connection_result}
+    results.update((test_name, "⏭️ Skipped: no connection") for test_name, _ in test_functions)
     
-    for test_name, test_func in test_functions:
-        print(f"\n🔬 Testing: {test_name}")
-        try:
-            result = test_func()
-            if isinstance(result, pd.DataFrame):
-                results[test_name] = f"✅ Success: {len(result):,} rows"
-            elif result is True:
-                results[test_name] = "✅ Success"
-            else:
-                results[test_name] = "❌ Failed"
-        except Exception as e:
-            results[test_name] = f"❌ Error: {e}"
+    if client is not None:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(test_functions)) as executor:
+            futures = {}
+            for test_name, test_func in test_functions:
+                print(f"\n🔬 Testing: {test_name}")
+                futures[executor.submit(test_func)] = test_name
+            
+            for future in concurrent.futures.as_completed(futures):
+                test_name = futures[future]
+                try:
+                    result = future.result()
+                    if isinstance(result, pd.DataFrame):
+                        results[test_name] = f"✅ Success: {len(result):,} rows"
+                    else:
+                        results[test_name] = "❌ Failed"
+                except Exception as e:
+                    results[test_name] = f"❌ Error: {e}"
     
     print(f"\n📋 TEST RESULTS:")
     for test, result in results.items():
@@ -5,13 +5,35 @@ This module contains all pre-built queries organized by category.
 Easy to add new queries and reuse across different scripts.
 """
 
-from typing import Optional, List
+import sys
+import functools
+from typing import Optional, List, Mapping, Callable
+from types import MappingProxyType
+from enum import Enum
 from datetime import datetime, timedelta
 
 
 class BaseQueries:
     """Base class for query categories"""
     
+    # Completed, successful, non-test orders - the shared base of every order query
+    _NET_ORDERS_CTE = """net_orders AS (
+            SELECT *
+            FROM general_marts.gm_order
+            WHERE final_payment_status = 'COMPLETED'
+              AND final_order_status = 'SUCCESSFUL'
+              AND is_test = 0
+        )"""
+    
+    # First net order time per user, used for the is_new_customer/returning flags
+    _USER_FIRST_CTE = """user_first AS (
+            SELECT
+                user_id,
+                min(created_at) AS first_at
+            FROM net_orders
+            GROUP BY user_id
+        )"""
+    
     @staticmethod
     def _format_date(date_obj: datetime) -> str:
         """Format date for ClickHouse queries"""
@@ -29,13 +51,22 @@ class CoreQueries(BaseQueries):
     """Core business queries for OFOOD"""
     
     @staticmethod
-    def x_map_vendor() -> str:
+    def x_map_vendor(open_only: bool = False, visible_only: bool = False, city_id: Optional[int] = None) -> str:
         """
         Get latest vendor data with location information (renamed from original vendor query)
         Returns: vendor_code, vendor_name, city_id, radius, id, status_id, visible, open, latitude, longitude
+        
+        Args:
+            open_only: Only vendors whose latest record has open = 1
+            visible_only: Only vendors whose latest record has visible = 1
+            city_id: Optional city filter
         """
-        return """
-        WITH ranked_vendors AS (
+        open_filter = "AND open = 1" if open_only else ""
+        visible_filter = "AND visible = 1" if visible_only else ""
+        city_filter = f"AND city_id = {city_id}" if city_id is not None else ""
+        
+        return f"""
+        WITH latest_vendors AS (
           SELECT
             v.vendor_code,
             v.vendor_name,
@@ -46,16 +77,12 @@ class CoreQueries(BaseQueries):
             v.visible,
             v.open,
             vl.latitude,
-            vl.longitude,
-            ROW_NUMBER()
-              OVER (
-                PARTITION BY v.vendor_code
-                ORDER BY v.id DESC
-              ) AS rn
+            vl.longitude
           FROM live.vendors v
           LEFT JOIN live.vendor_location vl
             ON v.id = vl.id
-          WHERE 1=1
+          ORDER BY v.id DESC
+          LIMIT 1 BY v.vendor_code
         )
         SELECT
           vendor_code,
@@ -68,8 +95,11 @@ class CoreQueries(BaseQueries):
           open,
           latitude,
           longitude
-        FROM ranked_vendors
-        WHERE rn = 1
+        FROM latest_vendors
+        WHERE 1=1
+        {open_filter}
+        {visible_filter}
+        {city_filter}
         ORDER BY vendor_code DESC
         """
     
@@ -78,9 +108,14 @@ class CoreQueries(BaseQueries):
         """
         Comprehensive order mapping with customer analysis
         Returns: All order data with customer segmentation and business metrics
+        
+        The organic/non_organic/assisted/dom flags are not computed here; add them to the
+        result with add_order_flags(df, 'x_map_order') (ofood_data getters do this for you)
         """
-        return """
-        WITH all_orders AS (
+        return f"""
+        WITH {BaseQueries._NET_ORDERS_CTE},
+        {BaseQueries._USER_FIRST_CTE},
+        all_orders AS (
             SELECT
                 created_at,
                 order_id,
@@ -105,17 +140,11 @@ class CoreQueries(BaseQueries):
                 vendor_longitude,
                 customer_latitude,
                 customer_longitude,
-                if(min(created_at) OVER (PARTITION BY user_id) = created_at, 1, 0) AS is_new_customer,
-                if(min(created_at) OVER (PARTITION BY user_id) < created_at, 1, 0) AS returning,
-                if(voucher_value = 0, 1, 0) AS organic,
-                if(voucher_value > 0, 1, 0) AS non_organic,
-                if(tapsifood_share_discount > 0, 1, 0) AS assisted,
-                if(tapsifood_share_discount > 0 or vendor_share_discount > 0, 1, 0) AS dom,
+                if(first_at = created_at, 1, 0) AS is_new_customer,
+                if(first_at < created_at, 1, 0) AS returning,
                 (total_price - vendor_share_discount + packing_price) AS aov_select
-            FROM general_marts.gm_order
-            WHERE final_payment_status = 'COMPLETED'
-              AND final_order_status = 'SUCCESSFUL'
-              AND is_test = 0
+            FROM net_orders
+            LEFT JOIN user_first USING (user_id)
         ), filtered_orders AS (
             SELECT *
             FROM all_orders
@@ -129,6 +158,9 @@ class CoreQueries(BaseQueries):
         """
         Vendor DOM (Discount on Marketplace) analysis
         
+        The organic/non_organic flags are not computed here; add them to the result
+        with add_order_flags(df, 'x_vdom') (ofood_data getters do this for you)
+        
         Args:
             city_id: Optional city filter
             jalali_year: Jalali year (default: 1403)
@@ -137,7 +169,9 @@ class CoreQueries(BaseQueries):
         city_filter = f"AND city_id = {city_id}" if city_id else ""
         
         return f"""
-        WITH all_orders AS (
+        WITH {BaseQueries._NET_ORDERS_CTE},
+        {BaseQueries._USER_FIRST_CTE},
+        all_orders AS (
             SELECT
                 created_at,
                 order_id,
@@ -155,16 +189,12 @@ class CoreQueries(BaseQueries):
                 packing_price,
                 vendor_code,
                 vendor_name,
-                if(min(created_at) OVER (PARTITION BY user_id) = created_at, 1, 0) AS is_new_customer,
-                if(min(created_at) OVER (PARTITION BY user_id) < created_at, 1, 0) AS returning,
-                if(voucher_value = 0, 1, 0) AS organic,
-                if(voucher_value > 0, 1, 0) AS non_organic,
+                if(first_at = created_at, 1, 0) AS is_new_customer,
+                if(first_at < created_at, 1, 0) AS returning,
                 (total_price - vendor_share_discount + packing_price) AS nmv_select_1,
                 payable_price - vendor_share_discount AS nmv_select_2
-            FROM general_marts.gm_order
-            WHERE final_payment_status = 'COMPLETED'
-              AND final_order_status = 'SUCCESSFUL'
-              AND is_test = 0
+            FROM net_orders
+            LEFT JOIN user_first USING (user_id)
         ), filtered_orders AS (
             SELECT *
             FROM all_orders
@@ -177,12 +207,22 @@ class CoreQueries(BaseQueries):
         """
     
     @staticmethod
-    def x_net_live_vouchers() -> str:
+    def x_net_live_vouchers(columns: Optional[List[str]] = None) -> str:
         """
         Comprehensive voucher analysis with order data
         Returns: Orders with voucher details and usage constraints
+        
+        The organic/non_organic/assisted flags are not computed here; add them to the
+        result with add_order_flags(df, 'x_net_live_vouchers', columns)
+        (ofood_data getters do this for you)
+        
+        Args:
+            columns: Optional subset of output columns to return (default: all). Flag
+                     names are replaced by the columns add_order_flags derives them from
         """
-        return """
+        projection = ", ".join(_flag_source_columns(columns)) if columns else "*"
+        
+        return f"""
         WITH vouchers AS (
             SELECT
                 CAST(id AS String) AS voucher_id,
@@ -198,6 +238,8 @@ class CoreQueries(BaseQueries):
                 JSONExtract(usage_constraints, 'total', 'UInt32') AS uc_usage_total
             FROM live.vouchers
         ),
+        {BaseQueries._NET_ORDERS_CTE},
+        {BaseQueries._USER_FIRST_CTE},
         all_orders AS (
             SELECT 
                 o.created_at,
@@ -219,13 +261,10 @@ class CoreQueries(BaseQueries):
                 o.tapsifood_share_discount,
                 o.vendor_share_discount,
                 o.packing_price,
-                CAST(CASE WHEN o.final_payment_status = 'COMPLETED' AND o.final_order_status = 'SUCCESSFUL' THEN 1 ELSE 0 END AS UInt8) AS net,
-                CASE WHEN MIN(o.created_at) OVER (PARTITION BY o.user_id) = o.created_at THEN 1 ELSE 0 END AS is_new_customer,
-                CASE WHEN MIN(o.created_at) OVER (PARTITION BY o.user_id) < o.created_at THEN 1 ELSE 0 END AS returning,
+                if(o.final_payment_status = 'COMPLETED' AND o.final_order_status = 'SUCCESSFUL', 1, 0) AS net,
+                CASE WHEN uf.first_at = o.created_at THEN 1 ELSE 0 END AS is_new_customer,
+                CASE WHEN uf.first_at < o.created_at THEN 1 ELSE 0 END AS returning,
                 ROW_NUMBER() OVER (PARTITION BY o.user_id ORDER BY o.created_at) AS rn,
-                CASE WHEN o.voucher_value = 0 THEN 1 ELSE 0 END AS organic,
-                CASE WHEN o.voucher_value > 0 THEN 1 ELSE 0 END AS non_organic,
-                CASE WHEN o.tapsifood_share_discount > 0 THEN 1 ELSE 0 END AS assisted,
                 (o.total_price - o.vendor_share_discount + o.packing_price) AS aov_select,
                 v.type,
                 v.code,
@@ -237,60 +276,18 @@ class CoreQueries(BaseQueries):
                 v.end_at,
                 v.orders_minValue,
                 v.uc_usage_total
-            FROM general_marts.gm_order o
+            FROM net_orders o
             LEFT JOIN vouchers v ON o.voucher_id = v.voucher_id
-            WHERE o.final_payment_status = 'COMPLETED' 
-              AND o.final_order_status = 'SUCCESSFUL' 
-              AND o.is_test = 0
+            LEFT JOIN user_first uf ON o.user_id = uf.user_id
         ),
-        deduped_orders AS (
-            SELECT
-                *,
-                ROW_NUMBER() OVER (
-                    PARTITION BY 
-                        created_at,
-                        order_id,
-                        vendor_id,
-                        user_id,
-                        total_price,
-                        city_id,
-                        business_line,
-                        marketing_area,
-                        final_order_status,
-                        final_payment_status,
-                        is_test,
-                        voucher_value,
-                        voucher_id,
-                        dt_jalali_month_number,
-                        dt_jalali_year_number,
-                        dt_jalali_week_number,
-                        tapsifood_share_discount,
-                        vendor_share_discount,
-                        packing_price,
-                        net,
-                        is_new_customer,
-                        returning,
-                        rn,
-                        organic,
-                        non_organic,
-                        assisted,
-                        aov_select,
-                        type,
-                        code,
-                        discount_strategy,
-                        discount_amount,
-                        discount_max_amount,
-                        start_at,
-                        end_at,
-                        orders_minValue,
-                        uc_usage_total
-                    ORDER BY used_count DESC
-                ) AS row_num
+        latest_orders AS (
+            SELECT *
             FROM all_orders
+            ORDER BY used_count DESC
+            LIMIT 1 BY order_id
         )
-        SELECT *
-        FROM deduped_orders
-        WHERE row_num = 1
+        SELECT {projection}
+        FROM latest_orders
         """
     
     @staticmethod
@@ -298,13 +295,18 @@ class CoreQueries(BaseQueries):
         """
         Geolocation-based order analysis
         
+        The organic/non_organic/assisted flags are not computed here; add them to the
+        result with add_order_flags(df, 'x_geo') (ofood_data getters do this for you)
+        
         Args:
             city_id: Optional city filter
         """
         city_filter = f"WHERE city_id = {city_id}" if city_id else ""
         
         return f"""
-        WITH all_orders AS (
+        WITH {BaseQueries._NET_ORDERS_CTE},
+        {BaseQueries._USER_FIRST_CTE},
+        all_orders AS (
             SELECT 
                 created_at,
                 order_id,
@@ -328,21 +330,15 @@ class CoreQueries(BaseQueries):
                 vendor_code,
                 customer_longitude,
                 customer_latitude,
-                CAST(CASE WHEN final_payment_status = 'COMPLETED' AND final_order_status = 'SUCCESSFUL' THEN 1 ELSE 0 END AS UInt8) AS net,
-                CAST(CASE WHEN final_payment_status IN ('COMPLETED', 'REVERSE', 'REFUNDED') AND (cancel_reason != 'NEW_ORDER_NEED_FOR_CALL_ORDER' OR cancel_reason IS NULL) THEN 1 ELSE 0 END AS UInt8) AS gross,
-                CASE WHEN MIN(created_at) OVER (PARTITION BY user_id) = created_at THEN 1 ELSE 0 END AS is_new_customer,
-                CASE WHEN MIN(created_at) OVER (PARTITION BY user_id) < created_at THEN 1 ELSE 0 END AS returning,
+                if(final_payment_status = 'COMPLETED' AND final_order_status = 'SUCCESSFUL', 1, 0) AS net,
+                if(final_payment_status IN ('COMPLETED', 'REVERSE', 'REFUNDED') AND (cancel_reason != 'NEW_ORDER_NEED_FOR_CALL_ORDER' OR cancel_reason IS NULL), 1, 0) AS gross,
+                CASE WHEN first_at = created_at THEN 1 ELSE 0 END AS is_new_customer,
+                CASE WHEN first_at < created_at THEN 1 ELSE 0 END AS returning,
                 ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY created_at) AS rn,
-                CASE WHEN voucher_value = 0 THEN 1 ELSE 0 END AS organic,
-                CASE WHEN voucher_value > 0 THEN 1 ELSE 0 END AS non_organic,
-                CASE WHEN tapsifood_share_discount > 0 THEN 1 ELSE 0 END AS assisted,
                 (total_price - vendor_share_discount + packing_price) AS aov_select
             FROM 
-                general_marts.gm_order
-            WHERE 
-                final_payment_status = 'COMPLETED' 
-                AND final_order_status = 'SUCCESSFUL'
-                AND is_test = 0
+                net_orders
+                LEFT JOIN user_first USING (user_id)
         ),
         filtered_orders AS (
             SELECT *
@@ -434,90 +430,207 @@ class CoreQueries(BaseQueries):
         """
 
 
+# ============================================================================
+# Order Flags - cheap per-order flags derived in pandas instead of ClickHouse
+# ============================================================================
+
+# Flag -> (source columns, rule on their float64 values); NULL sources are NaN and compare False, like in SQL
+_ORDER_FLAGS = {
+    'organic': (('voucher_value',), lambda voucher_value: voucher_value == 0),
+    'non_organic': (('voucher_value',), lambda voucher_value: voucher_value > 0),
+    'assisted': (('tapsifood_share_discount',), lambda tapsifood_share: tapsifood_share > 0),
+    'dom': (('tapsifood_share_discount', 'vendor_share_discount'),
+            lambda tapsifood_share, vendor_share: (tapsifood_share > 0) | (vendor_share > 0)),
+}
+
+# Query name -> (flags to add, column they are inserted before)
+_QUERY_FLAGS = {
+    'x_map_order': (('organic', 'non_organic', 'assisted', 'dom'), 'aov_select'),
+    'x_vdom': (('organic', 'non_organic'), 'nmv_select_1'),
+    'x_net_live_vouchers': (('organic', 'non_organic', 'assisted'), 'aov_select'),
+    'x_geo': (('organic', 'non_organic', 'assisted'), 'aov_select'),
+}
+
+
+def _flag_source_columns(columns: List[str]) -> List[str]:
+    """Projection for columns, with flag names replaced by the columns they are derived from"""
+    projection = []
+    for column in columns:
+        sources = _ORDER_FLAGS[column][0] if column in _ORDER_FLAGS else (column,)
+        projection.extend(source for source in sources if source not in projection)
+    return projection
+
+
+def add_order_flags(df, query_name: str, columns: Optional[List[str]] = None):
+    """
+    Attach the 0/1 (int64, as the SQL flags were) order flags a warehouse query leaves to pandas
+    
+    Args:
+        df: DataFrame returned by the query (None is passed through)
+        query_name: CoreQueries method name, e.g. 'x_map_order'
+        columns: The columns requested from the query, if any; only requested flags are
+                 added, and source columns fetched just for them are dropped
+    """
+    flags, before = _QUERY_FLAGS.get(query_name, ((), None))
+    if df is None or not flags:
+        return df
+    if columns:
+        flags = [flag for flag in flags if flag in columns]
+    
+    position = df.columns.get_loc(before) if before in df.columns else len(df.columns)
+    for flag in flags:
+        sources, rule = _ORDER_FLAGS[flag]
+        if not all(source in df.columns for source in sources):
+            continue  # source column not selected
+        values = rule(*(df[source].to_numpy(dtype='float64', na_value=float('nan')) for source in sources))
+        # Full-width ints, so e.g. organic - non_organic can't wrap around like uint8 would
+        df.insert(position, flag, values.astype('int64'))
+        position += 1
+    
+    if columns:
+        df = df[[column for column in dict.fromkeys(columns) if column in df.columns]]
+    return df
+
+
 # ============================================================================
 # Query Registry - Easy access to all queries
 # ============================================================================
 
-class QueryRegistry:
-    """Central registry of all available queries"""
+class QueryRegistry(str, Enum):
+    """
+    Central registry of all available queries
     
-    # Core Business Queries
-    X_MAP_VENDOR = CoreQueries.x_map_vendor
-    X_MAP_ORDER = CoreQueries.x_map_order
-    X_VDOM = CoreQueries.x_vdom
-    X_NET_LIVE_VOUCHERS = CoreQueries.x_net_live_vouchers
-    X_GEO = CoreQueries.x_geo
-    TF_VENDORS = CoreQueries.tf_vendors
-    TF_MENU = CoreQueries.tf_menu
+    Each member's value is the name of its CoreQueries method, and calling a member
+    renders that query, e.g. QueryRegistry.X_VDOM(city_id=1).
+    """
+    
+    # Core Business Queries: (CoreQueries method, category, short name, description)
+    X_MAP_VENDOR = ('x_map_vendor', 'mapping', 'vendor', 'Latest vendor data with locations')
+    X_MAP_ORDER = ('x_map_order', 'mapping', 'order', 'Comprehensive order mapping with customer analysis')
+    X_VDOM = ('x_vdom', 'analysis', 'vdom', 'Vendor DOM (Discount on Marketplace) analysis')
+    X_NET_LIVE_VOUCHERS = ('x_net_live_vouchers', 'analysis', 'vouchers', 'Comprehensive voucher analysis with orders')
+    X_GEO = ('x_geo', 'analysis', 'geo', 'Geolocation-based order analysis')
+    TF_VENDORS = ('tf_vendors', 'reference', 'tf_vendors', 'TapsiFood vendors with SnappFood cross-reference')
+    TF_MENU = ('tf_menu', 'reference', 'tf_menu', 'TapsiFood menu items with pricing and discounts')
+    
+    def __new__(cls, method_name: str, category: str, short_name: str, description: str):
+        member = str.__new__(cls, method_name)
+        member._value_ = method_name
+        member.category = category
+        member.short_name = short_name
+        member.description = description
+        # Named like the query function, so members can stand in for it (e.g. as query_func)
+        member.__name__ = method_name
+        return member
+    
+    @functools.cached_property
+    def query_func(self) -> Callable[..., str]:
+        """The CoreQueries method behind this member, resolved on first use and then cached"""
+        return getattr(CoreQueries, self.value)
+    
+    def __call__(self, *args, **kwargs) -> str:
+        """Render this query's SQL"""
+        return self.query_func(*args, **kwargs)
+    
+    @classmethod
+    def get(cls, name: str) -> "QueryRegistry":
+        """Look up a query by registry name, e.g. QueryRegistry.get('X_VDOM')"""
+        return QUERY_BY_NAME[name.upper()]
     
     @classmethod
-    def list_all_queries(cls) -> dict:
-        """Get all available queries organized by category"""
-        return {
-            'mapping': {
-                'vendor': cls.X_MAP_VENDOR,
-                'order': cls.X_MAP_ORDER,
-            },
-            'analysis': {
-                'vdom': cls.X_VDOM,
-                'geo': cls.X_GEO,
-                'vouchers': cls.X_NET_LIVE_VOUCHERS,
-            },
-            'reference': {
-                'tf_vendors': cls.TF_VENDORS,
-                'tf_menu': cls.TF_MENU,
-            }
-        }
+    def list_all_queries(cls) -> Mapping[str, Mapping[str, "QueryRegistry"]]:
+        """Get all available queries organized by category (read-only, built once at import)"""
+        return _ALL_QUERIES
     
     @classmethod
     def print_available_queries(cls):
         """Print all available queries for easy reference"""
-        
-        print("📋 OFOOD Query Warehouse - Available Queries:")
-        print("=" * 60)
-        
-        print("\n🗺️  MAPPING QUERIES:")
-        print("   • X_MAP_VENDOR     : QueryRegistry.X_MAP_VENDOR")
-        print("   • X_MAP_ORDER      : QueryRegistry.X_MAP_ORDER")
-        
-        print("\n📊 ANALYSIS QUERIES:")
-        print("   • X_VDOM           : QueryRegistry.X_VDOM")
-        print("   • X_GEO            : QueryRegistry.X_GEO")  
-        print("   • X_NET_LIVE_VOUCHERS : QueryRegistry.X_NET_LIVE_VOUCHERS")
-        
-        print("\n📚 REFERENCE QUERIES:")
-        print("   • TF_VENDORS       : QueryRegistry.TF_VENDORS")
-        print("   • TF_MENU          : QueryRegistry.TF_MENU")
-        
-        print("\n💡 USAGE EXAMPLES:")
-        print("-" * 30)
-        print("Basic usage:")
-        print("   extractor.execute_query_from_warehouse(QueryRegistry.X_MAP_VENDOR)")
-        
-        print("\nWith parameters:")
-        print("   extractor.execute_query_from_warehouse(QueryRegistry.X_VDOM, city_id=1)")
-        print("   extractor.execute_query_from_warehouse(QueryRegistry.X_GEO, city_id=5)")
-        
-        print("\nCustom parameters:")
-        print("   extractor.execute_query_from_warehouse(")
-        print("       CoreQueries.x_vdom, ")
-        print("       city_id=1, jalali_year=1403, jalali_month=8")
-        print("   )")
-        
-        print("\n🏷️  QUERY DESCRIPTIONS:")
-        print("-" * 30)
-        descriptions = {
-            'X_MAP_VENDOR': 'Latest vendor data with locations',
-            'X_MAP_ORDER': 'Comprehensive order mapping with customer analysis',
-            'X_VDOM': 'Vendor DOM (Discount on Marketplace) analysis',
-            'X_NET_LIVE_VOUCHERS': 'Comprehensive voucher analysis with orders',
-            'X_GEO': 'Geolocation-based order analysis',
-            'TF_VENDORS': 'TapsiFood vendors with SnappFood cross-reference',
-            'TF_MENU': 'TapsiFood menu items with pricing and discounts'
-        }
-        
-        for query, desc in descriptions.items():
-            print(f"   • {query:<20}: {desc}")
+        sys.stdout.write(_HELP_TEXT)
+        sys.stdout.flush()
+
+
+# Registry name -> query, for string-driven dispatch in a single lookup
+QUERY_BY_NAME: Mapping[str, QueryRegistry] = MappingProxyType(dict(QueryRegistry.__members__))
+
+
+def _group_by_category() -> dict:
+    categories = {}
+    for query in QueryRegistry:
+        categories.setdefault(query.category, {})[query.short_name] = query
+    return categories
+
+
+# Category -> short name -> query; read-only so the shared mapping can't be altered by callers
+_ALL_QUERIES = MappingProxyType({
+    category: MappingProxyType(queries) for category, queries in _group_by_category().items()
+})
+
+
+# Registry name -> description, and its formatted listing for the reference text
+_DESCRIPTIONS: Mapping[str, str] = MappingProxyType({query.name: query.description for query in QueryRegistry})
+_DESCRIPTION_BLOCK = "\n".join(f"   • {name:<20}: {description}" for name, description in _DESCRIPTIONS.items())
+
+
+# Static reference text for print_available_queries, assembled once at import
+_HELP_TEXT = "\n".join([
+    "📋 OFOOD Query Warehouse - Available Queries:",
+    "=" * 60,
+    "",
+    "🗺️  MAPPING QUERIES:",
+    "   • X_MAP_VENDOR     : QueryRegistry.X_MAP_VENDOR",
+    "   • X_MAP_ORDER      : QueryRegistry.X_MAP_ORDER",
+    "",
+    "📊 ANALYSIS QUERIES:",
+    "   • X_VDOM           : QueryRegistry.X_VDOM",
+    "   • X_GEO            : QueryRegistry.X_GEO",
+    "   • X_NET_LIVE_VOUCHERS : QueryRegistry.X_NET_LIVE_VOUCHERS",
+    "",
+    "📚 REFERENCE QUERIES:",
+    "   • TF_VENDORS       : QueryRegistry.TF_VENDORS",
+    "   • TF_MENU          : QueryRegistry.TF_MENU",
+    "",
+    "💡 USAGE EXAMPLES:",
+    "-" * 30,
+    "Basic usage:",
+    "   extractor.execute_query_from_warehouse(QueryRegistry.X_MAP_VENDOR)",
+    "",
+    "With parameters:",
+    "   extractor.execute_query_from_warehouse(QueryRegistry.X_VDOM, city_id=1)",
+    "   extractor.execute_query_from_warehouse(QueryRegistry.X_GEO, city_id=5)",
+    "",
+    "Custom parameters:",
+    "   extractor.execute_query_from_warehouse(",
+    "       CoreQueries.x_vdom, ",
+    "       city_id=1, jalali_year=1403, jalali_month=8",
+    "   )",
+    "",
+    "🏷️  QUERY DESCRIPTIONS:",
+    "-" * 30,
+    _DESCRIPTION_BLOCK,
+]) + "\n"
+
+
+def render_query(query_func: Callable[..., str], **params) -> str:
+    """
+    Render a query function's SQL, cached per (function, parameters)
+    
+    Query functions are pure string templates, so the same parameters always give
+    the same SQL. List arguments are frozen to tuples for the cache key; calls with
+    other unhashable arguments are rendered without caching.
+    """
+    frozen_params = tuple(sorted(
+        (name, tuple(value) if isinstance(value, list) else value) for name, value in params.items()
+    ))
+    try:
+        hash(frozen_params)
+    except TypeError:
+        return query_func(**params)
+    return _render_query(query_func, frozen_params)
+
+
+@functools.lru_cache(maxsize=256)
+def _render_query(query_func: Callable[..., str], frozen_params: tuple) -> str:
+    return query_func(**dict(frozen_params))
 
 
 if __name__ == "__main__":